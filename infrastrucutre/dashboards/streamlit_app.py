@@ -72,6 +72,140 @@ except Exception as e:
     st.error(f"Error loading data: {str(e)}")
     st.stop()
 
+@st.cache_resource(max_entries=4)
+def sort_by_donor(df):
+    """Sort a frame by donor_id once so each donor's rows form one slice"""
+    # cache_resource hands back the cached frame itself rather than an
+    # unpickled copy; callers only read slices of it. The cache is shared by
+    # every session, so only the last few frames keep a sorted copy
+    sorted_df = df.sort_values('donor_id', kind='stable')
+    return sorted_df, sorted_df['donor_id'].to_numpy()
+
+def donor_rows(sorted_frame, donor_id):
+    """Rows for one donor from a frame returned by sort_by_donor"""
+    sorted_df, donor_ids = sorted_frame
+    start = np.searchsorted(donor_ids, donor_id, side='left')
+    end = np.searchsorted(donor_ids, donor_id, side='right')
+    return sorted_df.iloc[start:end]
+
+def average_ranks(values):
+    """1-based ranks with ties sharing their mean rank, like Series.rank()"""
+    values = np.asarray(values, dtype=np.float64)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse.ravel()]
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+def rfm_score(recency, frequency, amount):
+    """Mean of the recency (descending), frequency and amount ranks"""
+    return (average_ranks(-recency) + average_ranks(frequency) + average_ranks(amount)) / 3
+
+@st.cache_data
+def build_giving_figure(donations_df):
+    """Build the 2x2 giving patterns figure for a set of donations"""
+    # Prepare time-based data
+    dates = pd.to_datetime(donations_df['donation_date'])
+    donations_df = donations_df.assign(
+        date=dates,
+        month=dates.dt.month.astype('int8'),
+        day_of_week=dates.dt.dayofweek.astype('int8')
+    )
+    
+    # Create 2x2 subplots
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Monthly Giving Patterns', 'Daily Giving Patterns',
+                      'Gift Size Distribution', 'Cumulative Giving'),
+        vertical_spacing=0.15,
+        horizontal_spacing=0.1
+    )
+    
+    # Monthly patterns (named aggregation keeps the columns flat;
+    # reindexing by month number replaces the categorical sort)
+    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
+                  'July', 'August', 'September', 'October', 'November', 'December']
+    monthly_stats = donations_df.groupby('month', observed=True, sort=False).agg(
+        count=('amount', 'count'),
+        average=('amount', 'mean'),
+        total=('amount', 'sum')
+    ).reindex(range(1, 13))
+    
+    fig.add_trace(
+        go.Bar(x=month_order, y=monthly_stats['total'],
+              name='Monthly Total'),
+        row=1, col=1
+    )
+    
+    # Daily patterns
+    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    daily_stats = donations_df.groupby('day_of_week', observed=True, sort=False).agg(
+        count=('amount', 'count'),
+        average=('amount', 'mean'),
+        total=('amount', 'sum')
+    ).reindex(range(7))
+    
+    fig.add_trace(
+        go.Bar(x=day_order, y=daily_stats['count'],
+              name='Daily Count'),
+        row=1, col=2
+    )
+    
+    # Distribution
+    fig.add_trace(
+        go.Histogram(x=donations_df['amount'], nbinsx=50,
+                    name='Gift Distribution'),
+        row=2, col=1
+    )
+    
+    # Cumulative
+    sorted_donations = donations_df.sort_values('date')
+    sorted_donations['cumulative'] = sorted_donations['amount'].cumsum()
+    
+    fig.add_trace(
+        go.Scatter(x=sorted_donations['date'], y=sorted_donations['cumulative'],
+                  name='Cumulative Giving'),
+        row=2, col=2
+    )
+    
+    # Update layout
+    fig.update_layout(
+        height=800,
+        showlegend=True,
+        title_text='Giving Patterns Analysis'
+    )
+    
+    return fig
+
+@st.cache_data
+def build_state_map(state_summary):
+    """Build the state choropleth of total donations"""
+    return px.choropleth(
+        state_summary,
+        locations='state',
+        locationmode='USA-states',
+        color='total_amount',
+        scope='usa',
+        title='Total Donations by State',
+        color_continuous_scale='Viridis'
+    )
+
+@st.cache_data
+def build_segment_scatter(segment_donors):
+    """Build the frequency vs total giving scatter coloured by segment"""
+    return px.scatter(
+        segment_donors,
+        x='frequency',
+        y='total_amount',
+        color='segment',
+        size='recency_days',
+        title='Segment Distribution: Frequency vs Total Giving',
+        labels={
+            'frequency': 'Number of Donations',
+            'total_amount': 'Total Giving ($)',
+            'recency_days': 'Days Since Last Gift'
+        }
+    )
+
 # Initialize visualizer
 viz = DonorVisualization()
 
@@ -103,20 +237,25 @@ filtered_donors = donors.copy()
 if selected_states:
     filtered_donors = filtered_donors[filtered_donors['state'].isin(selected_states)]
 
-filtered_donations = donations[
-    (donations['donation_date'] >= pd.Timestamp(date_range[0])) &
-    (donations['donation_date'] <= pd.Timestamp(date_range[1]))
-]
+# Build one mask over the raw arrays so the donations frame is sliced once
+donation_dates = donations['donation_date'].to_numpy()
+donation_mask = (
+    (donation_dates >= np.datetime64(pd.Timestamp(date_range[0]))) &
+    (donation_dates <= np.datetime64(pd.Timestamp(date_range[1])))
+)
 
 if selected_campaigns:
-    filtered_donations = filtered_donations[
-        filtered_donations['campaign_id'].isin(
-            campaigns[campaigns['name'].isin(selected_campaigns)]['campaign_id']
-        )
-    ]
+    campaign_ids = campaigns.loc[campaigns['name'].isin(selected_campaigns), 'campaign_id'].to_numpy()
+    donation_mask &= np.isin(donations['campaign_id'].to_numpy(), campaign_ids)
+
+filtered_donations = donations[donation_mask]
 
-# Calculate KPIs
-total_donations = filtered_donations['amount'].sum()
+# Calculate KPIs (one reduction over the amount column, reused below)
+gift_amounts = filtered_donations['amount'].to_numpy()
+gift_count = gift_amounts.size
+total_donations = gift_amounts.sum()
+avg_gift = total_donations / gift_count if gift_count else np.nan
+median_gift = np.median(gift_amounts) if gift_count else np.nan
 top_decile_donors = filtered_donors[filtered_donors['decile'] == 10]
 
 # Display KPIs
@@ -127,7 +266,7 @@ kpi1, kpi2, kpi3, kpi4 = st.columns(4)
 kpi1.metric(
     'Total Donations',
     f'${total_donations:,.0f}',
-    f'Number of Gifts: {len(filtered_donations):,}'
+    f'Number of Gifts: {gift_count:,}'
 )
 
 kpi2.metric(
@@ -138,8 +277,8 @@ kpi2.metric(
 
 kpi3.metric(
     'Average Gift Size',
-    f'${filtered_donations["amount"].mean():,.0f}',
-    f'Median: ${filtered_donations["amount"].median():,.0f}'
+    f'${avg_gift:,.0f}',
+    f'Median: ${median_gift:,.0f}'
 )
 
 kpi4.metric(
@@ -162,83 +301,10 @@ tab1, tab2, tab3, tab4 = st.tabs([
 with tab1:
     st.header('Giving Patterns Analysis')
     
-    # Create subplots for the giving patterns
-    fig = go.Figure()
-    
     try:
-        # Prepare time-based data
-        filtered_donations['date'] = pd.to_datetime(filtered_donations['donation_date'])
-        filtered_donations['month'] = filtered_donations['date'].dt.month
-        filtered_donations['month_name'] = filtered_donations['date'].dt.strftime('%B')
-        filtered_donations['day_of_week'] = filtered_donations['date'].dt.dayofweek
-        filtered_donations['day_name'] = filtered_donations['date'].dt.strftime('%A')
-        
-        # Create 2x2 subplots
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Monthly Giving Patterns', 'Daily Giving Patterns',
-                          'Gift Size Distribution', 'Cumulative Giving'),
-            vertical_spacing=0.15,
-            horizontal_spacing=0.1
-        )
-        
-        # Monthly patterns
-        monthly_stats = filtered_donations.groupby('month_name').agg({
-            'amount': ['count', 'mean', 'sum']
-        }).reset_index()
-        monthly_stats.columns = ['month', 'count', 'average', 'total']
-        
-        # Sort by month order
-        month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                      'July', 'August', 'September', 'October', 'November', 'December']
-        monthly_stats['month'] = pd.Categorical(monthly_stats['month'], categories=month_order)
-        monthly_stats = monthly_stats.sort_values('month')
-        
-        fig.add_trace(
-            go.Bar(x=monthly_stats['month'], y=monthly_stats['total'],
-                  name='Monthly Total'),
-            row=1, col=1
-        )
-        
-        # Daily patterns
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        daily_stats = filtered_donations.groupby('day_name').agg({
-            'amount': ['count', 'mean', 'sum']
-        }).reset_index()
-        daily_stats.columns = ['day', 'count', 'average', 'total']
-        daily_stats['day'] = pd.Categorical(daily_stats['day'], categories=day_order)
-        daily_stats = daily_stats.sort_values('day')
-        
-        fig.add_trace(
-            go.Bar(x=daily_stats['day'], y=daily_stats['count'],
-                  name='Daily Count'),
-            row=1, col=2
-        )
-        
-        # Distribution
-        fig.add_trace(
-            go.Histogram(x=filtered_donations['amount'], nbinsx=50,
-                        name='Gift Distribution'),
-            row=2, col=1
-        )
-        
-        # Cumulative
-        sorted_donations = filtered_donations.sort_values('date')
-        sorted_donations['cumulative'] = sorted_donations['amount'].cumsum()
-        
-        fig.add_trace(
-            go.Scatter(x=sorted_donations['date'], y=sorted_donations['cumulative'],
-                      name='Cumulative Giving'),
-            row=2, col=2
-        )
-        
-        # Update layout
-        fig.update_layout(
-            height=800,
-            showlegend=True,
-            title_text='Giving Patterns Analysis'
-        )
-        
+        # Figures are cached on their input data, so reruns that leave the
+        # filters unchanged (e.g. switching tabs) skip rebuilding them
+        fig = build_giving_figure(filtered_donations[['donation_date', 'amount']])
         st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
@@ -259,7 +325,7 @@ with tab1:
     
     with m3:
         st.metric('Average Gift Size', 
-                  f'${filtered_donations["amount"].mean():,.2f}')
+                  f'${avg_gift:,.2f}')
     
     with m4:
         st.metric('Giving Consistency', 
@@ -277,8 +343,8 @@ with tab2:
         st.plotly_chart(
             viz.plot_donor_journey(
                 selected_donor,
-                filtered_donations,
-                events[events['donor_id'] == selected_donor]
+                donor_rows(sort_by_donor(filtered_donations), selected_donor),
+                donor_rows(sort_by_donor(events), selected_donor)
             ),
             use_container_width=True
         )
@@ -287,21 +353,20 @@ with tab3:
     st.header("Geographic Distribution of Donors")
     
     # State-level analysis
-    state_summary = filtered_donors.groupby('state').agg({
-        'donor_id': 'count',
-        'total_amount': 'sum'
-    }).reset_index()
+    state_codes, state_names = pd.factorize(filtered_donors['state'], sort=True)
+    has_state = state_codes >= 0
+    state_summary = pd.DataFrame({
+        'state': state_names,
+        'donor_id': np.bincount(state_codes[has_state], minlength=len(state_names)),
+        'total_amount': np.bincount(
+            state_codes[has_state],
+            weights=np.nan_to_num(filtered_donors['total_amount'].to_numpy(dtype=np.float64)[has_state]),
+            minlength=len(state_names)
+        )
+    })
     
     # Create choropleth map
-    fig = px.choropleth(
-        state_summary,
-        locations='state',
-        locationmode='USA-states',
-        color='total_amount',
-        scope='usa',
-        title='Total Donations by State',
-        color_continuous_scale='Viridis'
-    )
+    fig = build_state_map(state_summary)
     st.plotly_chart(fig, use_container_width=True)
     
     # Top states analysis
@@ -328,11 +393,11 @@ with tab4:
     st.header("Donor Segment Analysis")
     
     # Create RFM segments
-    filtered_donors['rfm_score'] = (
-        filtered_donors['recency_days'].rank(ascending=False) +
-        filtered_donors['frequency'].rank(ascending=True) +
-        filtered_donors['total_amount'].rank(ascending=True)
-    ) / 3
+    filtered_donors['rfm_score'] = rfm_score(
+        filtered_donors['recency_days'].to_numpy(),
+        filtered_donors['frequency'].to_numpy(),
+        filtered_donors['total_amount'].to_numpy()
+    )
     
     filtered_donors['segment'] = pd.qcut(
         filtered_donors['rfm_score'],
@@ -341,14 +406,13 @@ with tab4:
     )
     
     # Segment Overview
-    segment_summary = filtered_donors.groupby('segment').agg({
-        'donor_id': 'count',
-        'total_amount': ['sum', 'mean'],
-        'frequency': 'mean',
-        'recency_days': 'mean'
+    segment_summary = filtered_donors.groupby('segment', observed=False).agg(**{
+        'Count': ('donor_id', 'count'),
+        'Total Giving': ('total_amount', 'sum'),
+        'Avg Giving': ('total_amount', 'mean'),
+        'Avg Frequency': ('frequency', 'mean'),
+        'Avg Recency': ('recency_days', 'mean')
     }).round(2)
-    
-    segment_summary.columns = ['Count', 'Total Giving', 'Avg Giving', 'Avg Frequency', 'Avg Recency']
     st.dataframe(segment_summary, use_container_width=True)
     
     # Segment Visualizations
@@ -377,18 +441,8 @@ with tab4:
     # Segment Characteristics
     st.subheader('Segment Characteristics')
     
-    fig_chars = px.scatter(
-        filtered_donors,
-        x='frequency',
-        y='total_amount',
-        color='segment',
-        size='recency_days',
-        title='Segment Distribution: Frequency vs Total Giving',
-        labels={
-            'frequency': 'Number of Donations',
-            'total_amount': 'Total Giving ($)',
-            'recency_days': 'Days Since Last Gift'
-        }
+    fig_chars = build_segment_scatter(
+        filtered_donors[['frequency', 'total_amount', 'segment', 'recency_days']]
     )
     st.plotly_chart(fig_chars, use_container_width=True)
 
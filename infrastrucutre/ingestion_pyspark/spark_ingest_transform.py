@@ -17,11 +17,12 @@ from typing import Dict, List
 from pyspark.sql import SparkSession
 from pyspark.sql.functions import (
     col, to_date, sum as _sum, count as _count, lit, 
-    current_timestamp, year, month, dayofmonth
+    current_timestamp, year, broadcast
 )
 from pyspark.sql.window import Window
 from pyspark.sql.functions import datediff, max as _max
 from pyspark.sql.types import StructType, StructField, StringType, DoubleType, DateType
+from pyspark import StorageLevel
 
 # Load configurations
 def load_config() -> Dict:
@@ -37,6 +38,11 @@ spark = (SparkSession.builder
          .config("spark.hadoop.fs.s3a.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem")
          .config("spark.hadoop.fs.s3a.aws.credentials.provider", "com.amazonaws.auth.DefaultAWSCredentialsProviderChain")
          .config("spark.sql.adaptive.enabled", "true")
+         .config("spark.sql.adaptive.skewJoin.enabled", "true")
+         .config("spark.sql.adaptive.coalescePartitions.enabled", "true")
+         .config("spark.sql.adaptive.advisoryPartitionSizeInBytes", "128m")
+         .config("spark.sql.autoBroadcastJoinThreshold", "64mb")
+         .config("spark.sql.sources.partitionOverwriteMode", "dynamic")
          .config("spark.sql.streaming.metricsEnabled", "true")
          .getOrCreate())
 
@@ -46,6 +52,7 @@ logger = log4j.LogManager.getLogger(__name__)
 
 # Storage paths from config
 RAW_BASE = config['storage']['raw_path']
+BRONZE_BASE = config['storage'].get('bronze_path', f"{RAW_BASE}/bronze")
 CURATED_BASE = config['storage']['curated_path']
 ARCHIVE_BASE = config['storage']['archive_path']
 
@@ -75,39 +82,80 @@ schemas = {
     ])
 }
 
-def read_source(source_name: str, partition_date: str = None) -> None:
+def latest_modification(path: str) -> int:
+    """Newest file modification time (ms) under a Hadoop path, 0 if it does not exist"""
+    jvm_path = spark._jvm.org.apache.hadoop.fs.Path(path)
+    fs = jvm_path.getFileSystem(spark._jsc.hadoopConfiguration())
+    if not fs.exists(jvm_path):
+        return 0
+    latest = 0
+    files = fs.listFiles(jvm_path, True)
+    while files.hasNext():
+        latest = max(latest, files.next().getModificationTime())
+    return latest
+
+def convert_to_bronze(source_name: str, partition_date: str = None, refresh: bool = False) -> str:
+    """CSV to Parquet conversion of a raw source into the bronze layer, redone when stale"""
+    raw_path = f"{RAW_BASE}/{source_name}"
+    bronze_path = f"{BRONZE_BASE}/{source_name}"
+    if partition_date:
+        raw_path = f"{raw_path}/dt={partition_date}"
+        bronze_path = f"{bronze_path}/dt={partition_date}"
+    
+    # Reuse the bronze copy only if its write committed (_SUCCESS exists) no
+    # earlier than the newest raw file; a half-written copy from a failed run
+    # or a re-delivered raw partition is reconverted
+    committed_at = latest_modification(f"{bronze_path}/_SUCCESS")
+    if not refresh and committed_at and committed_at >= latest_modification(raw_path):
+        return bronze_path
+    
+    logger.info(f"Converting {source_name} CSV to Parquet at {bronze_path}")
+    reader = spark.read.option("header", True)
+    if source_name in schemas:
+        reader = reader.schema(schemas[source_name])
+    reader.csv(raw_path).write.mode("overwrite").parquet(bronze_path)
+    return bronze_path
+
+def read_source(source_name: str, partition_date: str = None, refresh_bronze: bool = False) -> None:
     """Read source data with schema validation and partitioning"""
     logger.info(f"Reading {source_name} data...")
     
-    # Build source path
-    source_path = f"{RAW_BASE}/{source_name}"
-    if partition_date:
-        source_path = f"{source_path}/dt={partition_date}"
+    # Columnar bronze copy gives column pruning and predicate pushdown
+    source_path = convert_to_bronze(source_name, partition_date, refresh_bronze)
     
     # Read with schema validation
-    df = (spark.read
-          .option("header", True)
-          .schema(schemas.get(source_name))
-          .csv(source_path))
-    
-    # Log metrics
-    logger.info(f"Read {df.count()} rows from {source_name}")
-    return df
+    reader = spark.read
+    if source_name in schemas:
+        reader = reader.schema(schemas[source_name])
+    return reader.parquet(source_path)
 
 def validate_data_quality(df, rules: List[Dict]) -> bool:
     """Apply data quality rules"""
-    for rule in rules:
-        if rule['type'] == 'not_null':
-            null_count = df.filter(col(rule['column']).isNull()).count()
-            if null_count > rule['threshold']:
-                logger.error(f"Data quality check failed: {rule['column']} has {null_count} null values")
-                return False
+    not_null_rules = [r for r in rules if r['type'] == 'not_null']
+    if not not_null_rules:
+        return True
+    
+    # Count nulls for every rule in a single aggregation pass
+    null_counts = df.agg(*[
+        _sum(col(r['column']).isNull().cast('long')).alias(f"rule_{i}")
+        for i, r in enumerate(not_null_rules)
+    ]).collect()[0]
+    
+    for i, rule in enumerate(not_null_rules):
+        null_count = null_counts[f"rule_{i}"] or 0
+        if null_count > rule['threshold']:
+            logger.error(f"Data quality check failed: {rule['column']} has {null_count} null values")
+            return False
     return True
 
 # Parse arguments
 parser = argparse.ArgumentParser()
 parser.add_argument('--source', help='Source to process')
 parser.add_argument('--date', help='Processing date (YYYY-MM-DD)')
+parser.add_argument('--with-fact-tables', action='store_true',
+                    help='Also write fact_donation and dim_donor to the curated layer')
+parser.add_argument('--refresh-bronze', action='store_true',
+                    help='Reconvert raw CSV sources to bronze Parquet even when a current copy exists')
 args = parser.parse_args()
 
 # Process date for partitioning
@@ -115,10 +163,10 @@ process_date = args.date or datetime.now().strftime('%Y-%m-%d')
 
 try:
     # Read source data
-    donors = read_source('donors', process_date)
-    donations = read_source('donations', process_date)
-    events = read_source('events', process_date)
-    wealth = read_source('wealth_external', process_date)
+    donors = read_source('donors', process_date, args.refresh_bronze)
+    donations = read_source('donations', process_date, args.refresh_bronze)
+    events = read_source('events', process_date, args.refresh_bronze)
+    wealth = read_source('wealth_external', process_date, args.refresh_bronze)
 
     # Transform donations
     donations = donations.withColumn("donation_date", to_date(col("donation_date"))) \
@@ -135,17 +183,21 @@ try:
         "wealth_index", "engagement_index"
     )
 
-    # Calculate RFM metrics
+    # Calculate RFM metrics; the join strategy against the donor dimension is
+    # left to AQE, which broadcasts the per-donor aggregate when it fits under
+    # autoBroadcastJoinThreshold and otherwise reuses the aggregate's shuffle
     rfm = fact_donation.groupBy("donor_id").agg(
         _sum("amount").alias("total_amount"),
         _count("*").alias("frequency"),
         _max("donation_date").alias("last_gift")
     ).withColumn("recency_days", datediff(current_timestamp(), col("last_gift")))
 
-    # Join features
-    features = (dim_donor.join(rfm, "donor_id", "left")
-               .join(events, "donor_id", "left")
-               .join(wealth, "donor_id", "left")
+    # Join features (events and wealth are small per-donor tables, so
+    # broadcast them instead of shuffling the donor dimension)
+    features = (dim_donor
+               .join(rfm, "donor_id", "left")
+               .join(broadcast(events), "donor_id", "left")
+               .join(broadcast(wealth), "donor_id", "left")
                .fillna({
                    "total_amount": 0,
                    "frequency": 0,
@@ -154,27 +206,36 @@ try:
                    "volunteer_hours": 0,
                    "wealth_score_ext": 0
                }))
+    
+    # Quality checks and the write both scan features; keep it materialized
+    features = features.persist(StorageLevel.MEMORY_AND_DISK)
 
     # Validate data quality
     quality_rules = config['data_quality_rules']
     if not all(validate_data_quality(df, quality_rules) for df in [features, fact_donation, dim_donor]):
         raise Exception("Data quality validation failed")
 
-    # Write to curated layer with partitioning
-    partition_cols = ['year', 'month', 'day']
-    for df, name in [(features, 'donor_features'),
-                     (fact_donation, 'fact_donation'),
-                     (dim_donor, 'dim_donor')]:
-        
-        # Add partition columns
-        df = (df.withColumn('year', year(current_timestamp()))
-              .withColumn('month', month(current_timestamp()))
-              .withColumn('day', dayofmonth(current_timestamp())))
+    # Write to curated layer. The denormalized donor_features table is the
+    # primary artifact, so ML reads it without re-joining; the fact and
+    # dimension tables are only written when a downstream asks for them.
+    # Only fact_donation gets a partition column with real selectivity
+    # (gift year); the per-donor tables are written unpartitioned.
+    outputs = [(features, 'donor_features', [])]
+    if args.with_fact_tables:
+        fact_donation = fact_donation.withColumn('donation_year', year(col('donation_date')))
+        outputs += [(fact_donation, 'fact_donation', ['donation_year']),
+                    (dim_donor, 'dim_donor', [])]
+    
+    for df, name, partition_cols in outputs:
         
-        # Write partitioned Parquet
-        (df.write
-         .partitionBy(partition_cols)
-         .mode("overwrite")
+        # Cluster rows by partition value so each partition directory gets
+        # one file, and only replace the partitions present in this run
+        if partition_cols:
+            writer = df.repartition(*partition_cols).write.partitionBy(*partition_cols)
+        else:
+            writer = df.write
+        (writer.mode("overwrite")
+         .option("maxRecordsPerFile", 5_000_000)
          .parquet(f"{CURATED_BASE}/{name}"))
         
         logger.info(f"Successfully wrote {name} to {CURATED_BASE}")
@@ -7,13 +7,37 @@ from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split, cross_val_score
-from xgboost import XGBRegressor, XGBClassifier
+from xgboost import XGBRegressor, XGBClassifier, DMatrix
 from lightgbm import LGBMRegressor
-import shap
 from typing import Dict, List, Optional, Tuple, Union
 import joblib
 from pathlib import Path
 
+def build_pipeline(feature_engineer, scaler, model,
+                   cache_dir: Optional[Union[str, Path]] = None) -> Pipeline:
+    """Feature engineering, scaling and model pipeline, memoizing fitted transformers under cache_dir"""
+    # Caching is opt-in: the temporal features depend on today's date, which
+    # is not part of the cache key, so a cache reused on a later day is stale
+    return Pipeline([
+        ('feature_engineering', feature_engineer),
+        ('scaler', scaler),
+        ('model', model)
+    ], memory=joblib.Memory(location=cache_dir, verbose=0))
+
+def explanation_input(pipeline: Pipeline, X: pd.DataFrame) -> Tuple[pd.Index, np.ndarray]:
+    """Engineered feature names and preprocessed float32 model input"""
+    X_features = pipeline.named_steps['feature_engineering'].transform(X)
+    X_model = np.ascontiguousarray(
+        pipeline.named_steps['scaler'].transform(X_features), dtype=np.float32
+    )
+    return X_features.columns, X_model
+
+def tree_contributions(model, X_model: np.ndarray) -> np.ndarray:
+    """SHAP contributions from the booster's native TreeSHAP, bias column last"""
+    if isinstance(model, LGBMRegressor):
+        return model.booster_.predict(X_model, pred_contrib=True)
+    return model.get_booster().predict(DMatrix(X_model), pred_contribs=True)
+
 class DonorFeatureEngineering(BaseEstimator, TransformerMixin):
     """Custom transformer for donor feature engineering"""
     
@@ -25,24 +49,28 @@ class DonorFeatureEngineering(BaseEstimator, TransformerMixin):
         return self
         
     def transform(self, X):
-        X_transformed = X.copy()
+        # Compute on the underlying arrays and attach all new columns in a
+        # single assign rather than copying X and adding them one by one
+        new_features = {}
         
         if self.temporal_features:
             # Add temporal features
-            X_transformed['days_since_first'] = (
-                pd.to_datetime('now') - pd.to_datetime(X_transformed['first_donation'])
-            ).dt.days
-            
-            X_transformed['donation_frequency'] = (
-                X_transformed['frequency'] / X_transformed['days_since_first']
+            first_donation = X['first_donation']
+            if not pd.api.types.is_datetime64_dtype(first_donation):
+                first_donation = pd.to_datetime(first_donation)
+            first_donation = first_donation.to_numpy(dtype='datetime64[D]')
+            days_since_first = (np.datetime64('now', 'D') - first_donation) / np.timedelta64(1, 'D')
+            new_features['days_since_first'] = days_since_first
+            new_features['donation_frequency'] = (
+                X['frequency'].to_numpy() / days_since_first
             ) * 365  # Annualized frequency
             
         if self.interaction_features:
             # Create interaction features
-            X_transformed['wealth_engagement'] = X_transformed['wealth_score'] * X_transformed['engagement_score']
-            X_transformed['frequency_monetary'] = X_transformed['frequency'] * X_transformed['total_amount']
+            new_features['wealth_engagement'] = X['wealth_score'].to_numpy() * X['engagement_score'].to_numpy()
+            new_features['frequency_monetary'] = X['frequency'].to_numpy() * X['total_amount'].to_numpy()
             
-        return X_transformed
+        return X.assign(**new_features)
 
 class DonorLifetimeValue:
     """Predict donor lifetime value using advanced ML techniques"""
@@ -50,10 +78,12 @@ class DonorLifetimeValue:
     def __init__(self, 
                  prediction_horizon: int = 365,
                  feature_engineering: bool = True,
-                 model_type: str = 'xgboost'):
+                 model_type: str = 'xgboost',
+                 cache_dir: Optional[Union[str, Path]] = None):
         self.prediction_horizon = prediction_horizon
         self.feature_engineering = feature_engineering
         self.model_type = model_type
+        self.cache_dir = cache_dir
         
         # Initialize pipeline components
         self.feature_engineer = DonorFeatureEngineering()
@@ -75,14 +105,7 @@ class DonorLifetimeValue:
             )
             
         # Create pipeline
-        self.pipeline = Pipeline([
-            ('feature_engineering', self.feature_engineer),
-            ('scaler', self.scaler),
-            ('model', self.model)
-        ])
-        
-        # Initialize SHAP explainer
-        self.explainer = None
+        self.pipeline = build_pipeline(self.feature_engineer, self.scaler, self.model, cache_dir)
         
     def prepare_target(self, 
                       donations: pd.DataFrame,
@@ -112,9 +135,6 @@ class DonorLifetimeValue:
         
         self.pipeline.fit(X, y)
         
-        # Initialize SHAP explainer
-        self.explainer = shap.TreeExplainer(self.pipeline.named_steps['model'])
-        
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """Predict donor LTV"""
         return self.pipeline.predict(X)
@@ -127,13 +147,13 @@ class DonorLifetimeValue:
         if donor_ids is not None:
             X = X[X['donor_id'].isin(donor_ids)]
             
-        shap_values = self.explainer.shap_values(
-            self.pipeline.named_steps['feature_engineering'].transform(X)
-        )
+        feature_names, X_model = explanation_input(self.pipeline, X)
+        contributions = tree_contributions(self.pipeline.named_steps['model'], X_model)
         
         return {
-            'shap_values': shap_values,
-            'feature_names': X.columns,
+            'shap_values': contributions[:, :-1],
+            'base_values': contributions[:, -1],
+            'feature_names': feature_names,
             'donor_ids': X['donor_id'].values
         }
         
@@ -147,7 +167,6 @@ class DonorLifetimeValue:
         instance = cls()
         instance.pipeline = joblib.load(path)
         instance.model = instance.pipeline.named_steps['model']
-        instance.explainer = shap.TreeExplainer(instance.model)
         return instance
 
 class DonorSegmentation:
@@ -166,8 +185,13 @@ class DonorSegmentation:
         
         # Initialize models
         if method == 'kmeans':
-            from sklearn.cluster import KMeans
-            self.model = KMeans(n_clusters=n_clusters, random_state=42)
+            from sklearn.cluster import MiniBatchKMeans
+            self.model = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                batch_size=4096,
+                n_init=3,
+                random_state=42
+            )
         elif method == 'gmm':
             from sklearn.mixture import GaussianMixture
             self.model = GaussianMixture(n_components=n_clusters, random_state=42)
@@ -189,16 +213,30 @@ class DonorSegmentation:
         
     def analyze_segments(self, X: pd.DataFrame) -> pd.DataFrame:
         """Generate segment analysis"""
-        X['segment'] = self.predict(X)
-        
-        segment_analysis = X.groupby('segment').agg({
-            'donor_id': 'count',
-            'monetary': ['mean', 'sum'],
-            'frequency': 'mean',
-            'recency_days': 'mean',
-            'engagement_score': 'mean',
-            'wealth_score': 'mean'
-        }).round(2)
+        segments = self.predict(X)
+        X['segment'] = segments
+        
+        # Sort once by segment and reduce every metric column over the
+        # contiguous segment runs in a single pass
+        order = np.argsort(segments, kind='stable')
+        seg_sorted = segments[order]
+        starts = np.flatnonzero(np.r_[True, np.diff(seg_sorted) != 0])
+        counts = np.diff(np.r_[starts, len(seg_sorted)])
+        
+        metrics = ['monetary', 'frequency', 'recency_days', 'engagement_score', 'wealth_score']
+        sums = np.add.reduceat(X[metrics].to_numpy(np.float64)[order], starts, axis=0)
+        means = sums / counts[:, None]
+        
+        columns = {
+            ('donor_id', 'count'): counts,
+            ('monetary', 'mean'): means[:, 0],
+            ('monetary', 'sum'): sums[:, 0]
+        }
+        columns.update({(m, 'mean'): means[:, i] for i, m in enumerate(metrics) if i})
+        segment_analysis = pd.DataFrame(
+            columns,
+            index=pd.Index(seg_sorted[starts], name='segment')
+        ).round(2)
         
         # Calculate segment metrics
         segment_analysis['pct_donors'] = (
@@ -216,9 +254,11 @@ class DonorChurnPrediction:
     
     def __init__(self, 
                  churn_threshold_days: int = 365,
-                 feature_engineering: bool = True):
+                 feature_engineering: bool = True,
+                 cache_dir: Optional[Union[str, Path]] = None):
         self.churn_threshold_days = churn_threshold_days
         self.feature_engineering = feature_engineering
+        self.cache_dir = cache_dir
         
         # Initialize pipeline components
         self.feature_engineer = DonorFeatureEngineering()
@@ -231,14 +271,7 @@ class DonorChurnPrediction:
         )
         
         # Create pipeline
-        self.pipeline = Pipeline([
-            ('feature_engineering', self.feature_engineer),
-            ('scaler', self.scaler),
-            ('model', self.model)
-        ])
-        
-        # Initialize SHAP explainer
-        self.explainer = None
+        self.pipeline = build_pipeline(self.feature_engineer, self.scaler, self.model, cache_dir)
         
     def prepare_churn_target(self,
                            donations: pd.DataFrame,
@@ -249,15 +282,26 @@ class DonorChurnPrediction:
         else:
             analysis_date = pd.to_datetime(analysis_date)
             
-        last_donation = donations.groupby('donor_id')['donation_date'].max()
-        days_since_donation = (analysis_date - pd.to_datetime(last_donation)).dt.days
-        
-        return (days_since_donation > self.churn_threshold_days).astype(int)
+        # Parse once up front (no-op for datetime columns), then take the
+        # per-donor max and day difference on the raw datetime64 values
+        donation_dates = donations['donation_date']
+        if not pd.api.types.is_datetime64_dtype(donation_dates):
+            donation_dates = pd.to_datetime(donation_dates)
+            
+        last_donation = donation_dates.groupby(donations['donor_id']).max()
+        days_since_donation = (
+            analysis_date.to_datetime64() - last_donation.to_numpy()
+        ) // np.timedelta64(1, 'D')
+        
+        return pd.Series(
+            days_since_donation > self.churn_threshold_days,
+            index=last_donation.index,
+            dtype=np.uint8
+        )
         
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Train the churn prediction model"""
         self.pipeline.fit(X, y)
-        self.explainer = shap.TreeExplainer(self.pipeline.named_steps['model'])
         
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Predict churn probability"""
@@ -265,11 +309,11 @@ class DonorChurnPrediction:
         
     def explain_predictions(self, X: pd.DataFrame) -> Dict:
         """Generate SHAP explanations for predictions"""
-        shap_values = self.explainer.shap_values(
-            self.pipeline.named_steps['feature_engineering'].transform(X)
-        )
+        feature_names, X_model = explanation_input(self.pipeline, X)
+        contributions = tree_contributions(self.pipeline.named_steps['model'], X_model)
         
         return {
-            'shap_values': shap_values,
-            'feature_names': X.columns
+            'shap_values': contributions[:, :-1],
+            'base_values': contributions[:, -1],
+            'feature_names': feature_names
         }
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Shared Arrow CSV writer for the data generation and scoring scripts
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+def write_csv(data, path):
+    """Write a DataFrame or Arrow table with the Arrow CSV writer, keeping dates as YYYY-MM-DD"""
+    table = pa.Table.from_pandas(data, preserve_index=False) if isinstance(data, pd.DataFrame) else data
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32(), safe=False))
+
+    # Encode 64k-row batches into a 1 MiB write buffer rather than issuing
+    # a write per batch
+    with pa.output_stream(path, buffer_size=1 << 20) as sink:
+        pacsv.write_csv(table, sink, write_options=pacsv.WriteOptions(batch_size=65536))
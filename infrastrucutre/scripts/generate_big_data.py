@@ -16,6 +16,9 @@ args = parser.parse_args()
 
 fake = Faker('en_IN')
 np.random.seed(42)
+
+# Size of the Faker value pools donor columns are sampled from
+FAKER_POOL_SIZE = 10000
 Faker.seed(42)
 random.seed(42)
 
@@ -59,24 +62,45 @@ SOURCE_CHANNELS = [
 ]
 def generate_donors(n_donors):
     """Generate sophisticated donor profiles"""
-    data = []
-    for i in range(n_donors):
-        join_date = fake.date_between(start_date='-10y', end_date='today')
-        data.append({
-            'donor_id': i + 1,
-            'first_name': fake.first_name(),
-            'last_name': fake.last_name(),
-            'email': fake.email(),
-            'address': fake.street_address(),
-            'city': fake.city(),
-            'state': fake.state_abbr(),
-            'zip': fake.zipcode(),
-            'join_date': join_date,
-            'age': int(np.random.normal(55, 15).clip(25, 90)),
-            'occupation': fake.job(),
-            'source': np.random.choice(SOURCE_CHANNELS, p=[0.3, 0.2, 0.15, 0.15, 0.1, 0.05, 0.05])
-        })
-    return pd.DataFrame(data)
+    # Draw each text column from a small Faker-generated pool instead of
+    # calling Faker once per donor and field
+    pool_size = max(1, min(n_donors, FAKER_POOL_SIZE))
+    first_names = np.array([fake.first_name() for _ in range(pool_size)])
+    last_names = np.array([fake.last_name() for _ in range(pool_size)])
+    user_names = np.array([fake.user_name() for _ in range(pool_size)])
+    email_domains = np.array([fake.free_email_domain() for _ in range(pool_size)])
+    streets = np.array([fake.street_address() for _ in range(pool_size)])
+    cities = np.array([fake.city() for _ in range(pool_size)])
+    states = np.array([fake.state_abbr() for _ in range(pool_size)])
+    zipcodes = np.array([fake.zipcode() for _ in range(pool_size)])
+    jobs = np.array([fake.job() for _ in range(pool_size)])
+    
+    donor_ids = np.arange(1, n_donors + 1)
+    
+    # Donor id keeps pooled user names unique
+    emails = np.char.add(
+        np.char.add(np.random.choice(user_names, n_donors), donor_ids.astype(str)),
+        np.char.add('@', np.random.choice(email_domains, n_donors))
+    )
+    
+    # Join dates within the last ten years
+    today = np.datetime64('today', 'D')
+    join_dates = today - np.random.randint(0, 3651, n_donors, dtype=np.int32).astype('timedelta64[D]')
+    
+    return pd.DataFrame({
+        'donor_id': donor_ids,
+        'first_name': np.random.choice(first_names, n_donors),
+        'last_name': np.random.choice(last_names, n_donors),
+        'email': emails,
+        'address': np.random.choice(streets, n_donors),
+        'city': np.random.choice(cities, n_donors),
+        'state': np.random.choice(states, n_donors),
+        'zip': np.random.choice(zipcodes, n_donors),
+        'join_date': join_dates,
+        'age': np.clip(np.random.normal(55, 15, n_donors), 25, 90).astype(int),
+        'occupation': np.random.choice(jobs, n_donors),
+        'source': np.random.choice(SOURCE_CHANNELS, size=n_donors, p=[0.3, 0.2, 0.15, 0.15, 0.1, 0.05, 0.05])
+    })
 
 donors = []
 donors = generate_donors(args.donors)
@@ -97,20 +121,26 @@ for y in years:
 pd.DataFrame(camps).to_csv(os.path.join(args.out,"campaigns.csv"), index=False)
 
 # donations
-donations=[]; did=1
-for d in donors:
-    lam = 0.3 + 3.0*float(d["engagement_index"]) + 1.0*float(d["wealth_index"])
-    n = np.random.poisson(lam=lam)+1
-    for _ in range(n):
-        y=random.choice(years); m=random.randint(1,12); day=random.randint(1,28)
-        base=math.exp(np.random.normal(7.5,0.9))
-        amt=base*(1+2*float(d["wealth_index"]))*(0.6+0.8*float(d["engagement_index"]))
-        if random.random()<0.02*(1+float(d["wealth_index"])): amt*=10
-        donations.append({"donation_id":did,"donor_id":d["donor_id"],
-                          "campaign_id":random.choice(camps)["campaign_id"],
-                          "program":"Annual","amount":round(float(amt),2),
-                          "donation_date":dt.date(y,m,day).isoformat()}); did+=1
-pd.DataFrame(donations).to_csv(os.path.join(args.out,"donations.csv"), index=False)
+def synthesize_donations(donor_ids, wealth_idx, engagement_idx, years, campaign_ids):
+    """Draw all donations at once: per-donor Poisson counts expanded to gift rows"""
+    counts = np.random.poisson(lam=0.3 + 3.0*engagement_idx + 1.0*wealth_idx) + 1
+    n = int(counts.sum())
+    w = np.repeat(wealth_idx, counts); e = np.repeat(engagement_idx, counts)
+    y = np.random.choice(years, n); m = np.random.randint(1, 13, n); day = np.random.randint(1, 29, n)
+    dates = ((y - 1970).astype("datetime64[Y]") + (m - 1).astype("timedelta64[M]")).astype("datetime64[D]") \
+            + (day - 1).astype("timedelta64[D]")
+    amt = np.exp(np.random.normal(7.5, 0.9, n))*(1+2*w)*(0.6+0.8*e)
+    amt = np.where(np.random.random(n) < 0.02*(1+w), amt*10, amt)
+    return pd.DataFrame({"donation_id":np.arange(1, n+1), "donor_id":np.repeat(donor_ids, counts),
+                         "campaign_id":campaign_ids[np.random.randint(0, len(campaign_ids), n)],
+                         "program":"Annual", "amount":np.round(amt, 2),
+                         "donation_date":dates.astype(str)})
+
+donations = synthesize_donations(donors["donor_id"].to_numpy(),
+                                 donors["wealth_index"].to_numpy(dtype=float),
+                                 donors["engagement_index"].to_numpy(dtype=float),
+                                 np.asarray(years), np.array([c["campaign_id"] for c in camps]))
+donations.to_csv(os.path.join(args.out,"donations.csv"), index=False)
 
 # engagement & wealth
 pd.DataFrame([{"donor_id":d["donor_id"],
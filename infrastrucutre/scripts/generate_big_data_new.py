@@ -8,9 +8,12 @@ Sophisticated data generator for donor analytics with realistic patterns:
 """
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import random
 from datetime import datetime, timedelta
 from faker import Faker
+from joblib import Parallel, delayed, effective_n_jobs
 import pathlib
 import argparse
 
@@ -18,10 +21,19 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--donors", type=int, default=100000, help="Number of donor records to generate")
 parser.add_argument("--years", type=int, default=10, help="Years of historical data")
 parser.add_argument("--out", type=str, default="data/raw", help="Output directory")
+parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                    help="Output file format (parquet keeps dtypes and skips text encoding)")
+parser.add_argument("--jobs", type=int, default=1,
+                    help="Worker processes for donor shards (-1 uses every core)")
 args = parser.parse_args()
 
 fake = Faker('en_US')  # Changed to US locale
 np.random.seed(42)
+
+# Size of the Faker value pools donor columns are sampled from
+FAKER_POOL_SIZE = 10000
+# Rows per record batch when streaming Parquet output
+PARQUET_BATCH_ROWS = 1_000_000
 Faker.seed(42)
 random.seed(42)
 
@@ -64,26 +76,60 @@ SOURCE_CHANNELS = [
     'Phone Campaign'
 ]
 
-def generate_donors(n_donors):
+# Gift size multiplier by campaign type (other types use 1.0)
+CAMPAIGN_MULTIPLIERS = {
+    'Capital Campaign': 2.0,
+    'Endowment': 1.8,
+    'Annual Fund': 1.0,
+    'Emergency Relief': 1.2
+}
+
+def random_recent_dates(n_days, size):
+    """Uniform datetime64[D] dates between n_days ago and today"""
+    start = np.datetime64('today', 'D') - np.timedelta64(n_days, 'D')
+    offsets = np.random.randint(0, n_days + 1, size=size, dtype=np.int32)
+    return start + offsets.astype('timedelta64[D]')
+
+def generate_donors(n_donors, start_id=1):
     """Generate sophisticated donor profiles"""
-    data = []
-    for i in range(n_donors):
-        join_date = fake.date_between(start_date='-10y', end_date='today')
-        data.append({
-            'donor_id': i + 1,
-            'first_name': fake.first_name(),
-            'last_name': fake.last_name(),
-            'email': fake.email(),
-            'address': fake.street_address(),
-            'city': fake.city(),
-            'state': fake.state_abbr(),
-            'zip': fake.zipcode(),
-            'join_date': join_date,
-            'age': int(np.random.normal(55, 15).clip(25, 90)),
-            'occupation': fake.job(),
-            'source': np.random.choice(SOURCE_CHANNELS, p=[0.3, 0.2, 0.15, 0.15, 0.1, 0.05, 0.05])
-        })
-    return pd.DataFrame(data)
+    # Draw each text column from a small Faker-generated pool instead of
+    # calling Faker once per donor and field
+    pool_size = max(1, min(n_donors, FAKER_POOL_SIZE))
+    first_names = np.array([fake.first_name() for _ in range(pool_size)])
+    last_names = np.array([fake.last_name() for _ in range(pool_size)])
+    user_names = np.array([fake.user_name() for _ in range(pool_size)])
+    email_domains = np.array([fake.free_email_domain() for _ in range(pool_size)])
+    streets = np.array([fake.street_address() for _ in range(pool_size)])
+    cities = np.array([fake.city() for _ in range(pool_size)])
+    states = np.array([fake.state_abbr() for _ in range(pool_size)])
+    zipcodes = np.array([fake.zipcode() for _ in range(pool_size)])
+    jobs = np.array([fake.job() for _ in range(pool_size)])
+    
+    donor_ids = np.arange(start_id, start_id + n_donors)
+    
+    # Donor id keeps pooled user names unique
+    emails = np.char.add(
+        np.char.add(np.random.choice(user_names, n_donors), donor_ids.astype(str)),
+        np.char.add('@', np.random.choice(email_domains, n_donors))
+    )
+    
+    # Join dates within the last ten years
+    join_dates = random_recent_dates(3650, n_donors)
+    
+    return pd.DataFrame({
+        'donor_id': donor_ids,
+        'first_name': np.random.choice(first_names, n_donors),
+        'last_name': np.random.choice(last_names, n_donors),
+        'email': emails,
+        'address': np.random.choice(streets, n_donors),
+        'city': np.random.choice(cities, n_donors),
+        'state': np.random.choice(states, n_donors),
+        'zip': np.random.choice(zipcodes, n_donors),
+        'join_date': join_dates,
+        'age': np.clip(np.random.normal(55, 15, n_donors), 25, 90).astype(int),
+        'occupation': np.random.choice(jobs, n_donors),
+        'source': np.random.choice(SOURCE_CHANNELS, size=n_donors, p=[0.3, 0.2, 0.15, 0.15, 0.1, 0.05, 0.05])
+    })
 
 def generate_campaigns(n_years):
     """Generate fundraising campaigns with seasonal patterns"""
@@ -130,98 +176,115 @@ def generate_campaigns(n_years):
             
     return pd.DataFrame(data)
 
+def build_alias_table(weights):
+    """Walker alias tables for O(1) draws from a fixed discrete distribution"""
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=float) / np.sum(weights) * n
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+def sample_alias(prob, alias, size):
+    """Draw indices from alias tables built by build_alias_table"""
+    idx = np.random.randint(0, len(prob), size=size)
+    return np.where(np.random.random(size) < prob[idx], idx, alias[idx])
+
 def generate_donations(donors_df, campaigns_df):
     """Generate donations with realistic patterns"""
+    donor_ids = donors_df['donor_id'].values
+    
     # Identify high-value donors (20% of base)
     high_value_donors = np.random.choice(
-        donors_df['donor_id'].values, 
+        donor_ids, 
         size=int(len(donors_df)*0.2), 
         replace=False
     )
+    is_high_value = np.isin(donor_ids, high_value_donors)
     
-    data = []
-    donation_id = 1
+    # Draw every donor's gift count at once and expand to one row per gift
+    n_donations = np.random.poisson(np.where(is_high_value, 8, 3))
+    n_total = int(n_donations.sum())
+    gift_donor_ids = np.repeat(donor_ids, n_donations)
+    gift_high_value = np.repeat(is_high_value, n_donations)
     
-    for _, donor in donors_df.iterrows():
-        # Determine donor's giving pattern
-        is_high_value = donor['donor_id'] in high_value_donors
-        n_donations = np.random.poisson(8 if is_high_value else 3)
-        
-        for _ in range(n_donations):
-            campaign = campaigns_df.sample(n=1).iloc[0]
-            
-            # Amount based on donor segment and campaign type
-            base_amount = np.random.lognormal(
-                8 if is_high_value else 7,
-                1.2
-            )
-            
-            # Adjust amount based on campaign type
-            multiplier = {
-                'Capital Campaign': 2.0,
-                'Endowment': 1.8,
-                'Annual Fund': 1.0,
-                'Emergency Relief': 1.2
-            }.get(campaign['type'], 1.0)
-            
-            amount = int(base_amount * multiplier)
-            
-            # Add some major gifts
-            if is_high_value and random.random() < 0.1:
-                amount *= random.randint(5, 10)
-            
-            # Date within campaign period
-            donation_date = fake.date_between(
-                start_date=campaign['start_date'],
-                end_date=campaign['end_date']
-            )
-            
-            data.append({
-                'donation_id': donation_id,
-                'donor_id': donor['donor_id'],
-                'campaign_id': campaign['campaign_id'],
-                'amount': amount,
-                'donation_date': donation_date,
-                'payment_method': np.random.choice(
-                    PAYMENT_METHODS,
-                    p=[0.4, 0.25, 0.15, 0.1, 0.05, 0.05]
-                )
-            })
-            donation_id += 1
+    # Campaign for each gift, weighted by fundraising target, gathered from
+    # the campaign columns by index
+    prob, alias = build_alias_table(campaigns_df['target_amount'].values)
+    campaign_idx = sample_alias(prob, alias, n_total)
+    campaign_ids = campaigns_df['campaign_id'].values[campaign_idx]
+    multipliers = campaigns_df['type'].map(CAMPAIGN_MULTIPLIERS).fillna(1.0).values[campaign_idx]
     
-    return pd.DataFrame(data)
+    # Amount based on donor segment and campaign type
+    base_amount = np.random.lognormal(np.where(gift_high_value, 8, 7), 1.2)
+    amounts = (base_amount * multipliers).astype(int)
+    
+    # Add some major gifts
+    major_gift = gift_high_value & (np.random.random(n_total) < 0.1)
+    amounts = np.where(major_gift, amounts * np.random.randint(5, 11, n_total), amounts)
+    
+    # Date within campaign period
+    starts = pd.to_datetime(campaigns_df['start_date']).values.astype('datetime64[D]')[campaign_idx]
+    ends = pd.to_datetime(campaigns_df['end_date']).values.astype('datetime64[D]')[campaign_idx]
+    span_days = (ends - starts).astype(int) + 1
+    donation_dates = starts + np.random.randint(0, span_days).astype('timedelta64[D]')
+    
+    return pd.DataFrame({
+        'donation_id': np.arange(1, n_total + 1),
+        'donor_id': gift_donor_ids,
+        'campaign_id': campaign_ids,
+        'amount': amounts,
+        'donation_date': donation_dates,
+        'payment_method': np.random.choice(
+            PAYMENT_METHODS,
+            size=n_total,
+            p=[0.4, 0.25, 0.15, 0.1, 0.05, 0.05]
+        )
+    })
 
 def generate_engagement(donors_df):
     """Generate sophisticated engagement patterns"""
-    data = []
-    event_id = 1
+    donor_ids = donors_df['donor_id'].values
     
     # More engaged donors (30% of base)
     engaged_donors = np.random.choice(
-        donors_df['donor_id'].values,
+        donor_ids,
         size=int(len(donors_df)*0.3),
         replace=False
     )
+    is_engaged = np.isin(donor_ids, engaged_donors)
     
-    for _, donor in donors_df.iterrows():
-        is_engaged = donor['donor_id'] in engaged_donors
-        n_events = np.random.poisson(6 if is_engaged else 2)
-        
-        for _ in range(n_events):
-            event_type = np.random.choice(ENGAGEMENT_TYPES)
-            event_date = fake.date_between(start_date='-5y', end_date='today')
-            
-            data.append({
-                'event_id': event_id,
-                'donor_id': donor['donor_id'],
-                'event_type': event_type,
-                'event_date': event_date,
-                'hours': int(np.random.exponential(3)) if event_type == 'Volunteer Work' else 0,
-                'leadership_role': random.random() < 0.2 if is_engaged else False
-            })
-            event_id += 1
+    # Draw every donor's event count at once and expand to one row per event
+    n_events = np.random.poisson(np.where(is_engaged, 6, 2))
+    n_total = int(n_events.sum())
+    event_engaged = np.repeat(is_engaged, n_events)
     
-    return pd.DataFrame(data)
+    event_types = np.random.choice(ENGAGEMENT_TYPES, size=n_total)
+    
+    # Event date within the last five years
+    event_dates = random_recent_dates(5*365, n_total)
+    
+    hours = np.where(
+        event_types == 'Volunteer Work',
+        np.random.exponential(3, n_total).astype(int),
+        0
+    )
+    
+    return pd.DataFrame({
+        'event_id': np.arange(1, n_total + 1),
+        'donor_id': np.repeat(donor_ids, n_events),
+        'event_type': event_types,
+        'event_date': event_dates,
+        'hours': hours,
+        'leadership_role': event_engaged & (np.random.random(n_total) < 0.2)
+    })
 
 def generate_wealth_data(donors_df):
     """Generate correlated wealth indicators"""
@@ -241,6 +304,37 @@ def generate_wealth_data(donors_df):
     }
     return pd.DataFrame(data)
 
+def generate_shard(start_id, n_donors, campaigns_df, seed_seq):
+    """Generate one donor id range and every table keyed on those donors"""
+    # Each worker reseeds from its own child sequence so shards are
+    # independent and the output is reproducible for a given --jobs
+    seed = int(seed_seq.generate_state(1)[0])
+    np.random.seed(seed)
+    random.seed(seed)
+    Faker.seed(seed)
+    
+    donors = generate_donors(n_donors, start_id)
+    return (
+        donors,
+        generate_donations(donors, campaigns_df),
+        generate_engagement(donors),
+        generate_wealth_data(donors)
+    )
+
+def write_table(df, out_dir, name):
+    """Write a generated table in the requested output format"""
+    if args.format == 'parquet':
+        # Convert the frame one slice at a time so only a single record batch
+        # of Arrow data is alive beside the DataFrame; the schema is inferred
+        # once from the whole frame so every slice gets the same column types
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(out_dir/f'{name}.parquet', schema, compression='zstd') as writer:
+            for start in range(0, len(df), PARQUET_BATCH_ROWS):
+                chunk = df.iloc[start:start + PARQUET_BATCH_ROWS]
+                writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        df.to_csv(out_dir/f'{name}.csv', index=False)
+
 def main():
     print(f"Generating {args.donors:,} donor records with {args.years} years of history...")
     
@@ -249,25 +343,32 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate all datasets
-    print("Generating donors...")
-    donors = generate_donors(args.donors)
-    donors.to_csv(out_dir/'donors.csv', index=False)
-    
     print("Generating campaigns...")
     campaigns = generate_campaigns(args.years)
-    campaigns.to_csv(out_dir/'campaigns.csv', index=False)
+    write_table(campaigns, out_dir, 'campaigns')
     
-    print("Generating donations...")
-    donations = generate_donations(donors, campaigns)
-    donations.to_csv(out_dir/'donations.csv', index=False)
+    # Donors and their donations, events and wealth rows only depend on the
+    # donor's own draws, so contiguous donor id ranges run in parallel
+    n_jobs = effective_n_jobs(args.jobs)
+    bounds = np.linspace(0, args.donors, n_jobs + 1).astype(int)
+    seeds = np.random.SeedSequence(42).spawn(n_jobs)
+    print(f"Generating donors, donations, engagement and wealth data in {n_jobs} shard(s)...")
+    shards = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(generate_shard)(lo + 1, hi - lo, campaigns, seed)
+        for lo, hi, seed in zip(bounds[:-1], bounds[1:], seeds)
+    )
+    donors, donations, events, wealth = (
+        pd.concat(parts, ignore_index=True) for parts in zip(*shards)
+    )
     
-    print("Generating engagement events...")
-    events = generate_engagement(donors)
-    events.to_csv(out_dir/'engagement_events.csv', index=False)
+    # Row ids restart in every shard; renumber across the combined tables
+    donations['donation_id'] = np.arange(1, len(donations) + 1)
+    events['event_id'] = np.arange(1, len(events) + 1)
     
-    print("Generating wealth data...")
-    wealth = generate_wealth_data(donors)
-    wealth.to_csv(out_dir/'wealth_external.csv', index=False)
+    write_table(donors, out_dir, 'donors')
+    write_table(donations, out_dir, 'donations')
+    write_table(events, out_dir, 'engagement_events')
+    write_table(wealth, out_dir, 'wealth_external')
     
     print("\nData generation complete! Summary:")
     print(f"- Donors: {len(donors):,}")
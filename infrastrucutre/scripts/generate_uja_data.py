@@ -1,10 +1,20 @@
 """
 Script to generate realistic donor data for UJA Federation of NY
 """
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+from datetime import datetime
 import pathlib
+import argparse
+from multiprocessing import Pool
+from arrow_csv import write_csv
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--seed", type=int, default=42, help="Root seed shared by the UJA generators")
+parser.add_argument("--stream-id", type=int, default=0,
+                    help="Substream of the root seed to draw from (generate_uja_events.py uses 1)")
+parser.add_argument("--jobs", type=int, default=1, help="Worker processes for donation generation")
+args = parser.parse_args()
 
 # Common Jewish and general surnames
 surnames = [
@@ -47,45 +57,7 @@ cities = {
     'Deal': (40.2540, -73.9935)
 }
 
-# Generate donor data
-num_donors = 30000
-np.random.seed(42)
-
-donors = []
-for i in range(num_donors):
-    # Randomly select gender and corresponding first name
-    gender = np.random.choice(['M', 'F'])
-    if gender == 'M':
-        first_name = np.random.choice(male_first_names)
-    else:
-        first_name = np.random.choice(female_first_names)
-    
-    # Select location
-    city = np.random.choice(list(cities.keys()))
-    base_lat, base_lon = cities[city]
-    
-    # Add small random offset to coordinates
-    lat = base_lat + np.random.normal(0, 0.01)
-    lon = base_lon + np.random.normal(0, 0.01)
-    
-    # Generate wealth indicators (log-normal distribution)
-    wealth_score = int(np.random.lognormal(10, 1))
-    
-    donors.append({
-        'donor_id': i + 1,
-        'first_name': first_name,
-        'last_name': np.random.choice(surnames),
-        'gender': gender,
-        'city': city,
-        'state': 'NY' if city != 'Deal' else 'NJ',
-        'latitude': lat,
-        'longitude': lon,
-        'wealth_score': wealth_score
-    })
-
-donors_df = pd.DataFrame(donors)
-
-# Generate campaign data
+# Campaign data
 campaigns = [
     {'campaign_id': 1, 'name': 'Annual Campaign 2023', 'type': 'Annual'},
     {'campaign_id': 2, 'name': 'Israel Emergency Fund', 'type': 'Emergency'},
@@ -99,47 +71,119 @@ campaigns = [
     {'campaign_id': 10, 'name': 'Next Gen Engagement', 'type': 'Program'}
 ]
 
-campaigns_df = pd.DataFrame(campaigns)
-
-# Generate donation data
+# Donation date window
 start_date = datetime(2023, 1, 1)
 end_date = datetime(2025, 9, 30)
 date_range = (end_date - start_date).days
 
-donations = []
-for donor in donors:
-    # Number of donations follows Poisson distribution
-    num_donations = np.random.poisson(3)  # Average 3 donations per donor
-    
-    for _ in range(num_donations):
-        donation_date = start_date + timedelta(days=np.random.randint(0, date_range))
-        
-        # Amount based on wealth score with some randomness
-        base_amount = donor['wealth_score'] * 10
-        amount = int(np.random.lognormal(np.log(base_amount), 0.5))
-        
-        # Select campaign - weight toward annual campaigns
-        campaign_weights = [3 if c['type'] == 'Annual' else 1 for c in campaigns]
-        campaign_id = np.random.choice(campaigns_df['campaign_id'], p=np.array(campaign_weights)/sum(campaign_weights))
-        
-        donations.append({
-            'donation_id': len(donations) + 1,
-            'donor_id': donor['donor_id'],
-            'campaign_id': campaign_id,
-            'amount': amount,
-            'donation_date': donation_date
-        })
-
-donations_df = pd.DataFrame(donations)
-
-# Save files
-root = pathlib.Path(__file__).resolve().parents[1]
-data_dir = root / 'data/raw'
+def generate_donations(donor_ids, wealth_scores, seed_seq):
+    """Generate donations for one chunk of donors from its own seed substream"""
+    rng = np.random.default_rng(seed_seq)
+    
+    # Number of donations per donor follows Poisson distribution (average 3);
+    # draw every count at once and expand donor columns to one row per gift
+    counts = rng.poisson(3, len(donor_ids))
+    total = int(counts.sum())
+    
+    day_offsets = rng.integers(0, date_range, total)
+    
+    # Amount based on wealth score with some randomness
+    base_amount = np.repeat(wealth_scores, counts) * 10
+    
+    # Select campaign - weight toward annual campaigns
+    campaign_weights = np.array([3 if c['type'] == 'Annual' else 1 for c in campaigns])
+    
+    return {
+        'donor_id': np.repeat(donor_ids, counts),
+        'campaign_id': rng.choice(
+            np.array([c['campaign_id'] for c in campaigns]),
+            size=total,
+            p=campaign_weights / campaign_weights.sum()
+        ),
+        'amount': rng.lognormal(np.log(base_amount), 0.5).astype(int),
+        'donation_date': np.datetime64(start_date.date(), 'D') + day_offsets.astype('timedelta64[D]')
+    }
 
-donors_df.to_csv(data_dir / 'donors.csv', index=False)
-campaigns_df.to_csv(data_dir / 'campaigns.csv', index=False)
-donations_df.to_csv(data_dir / 'donations.csv', index=False)
+def main():
+    # Generate donor data
+    num_donors = 30000
+    # Independent substream of the shared root seed, so this script and
+    # generate_uja_events.py never draw overlapping sequences
+    stream_seq = np.random.SeedSequence(args.seed).spawn(args.stream_id + 1)[args.stream_id]
+    rng = np.random.default_rng(stream_seq)
+    
+    male_arr = np.array(male_first_names)
+    female_arr = np.array(female_first_names)
+    surname_arr = np.array(surnames)
+    city_arr = np.array(list(cities.keys()))
+    coords = np.array(list(cities.values()), dtype=np.float64)  # (n_cities, 2) lat/lon
+    
+    # Randomly select gender and corresponding first name
+    gender_idx = rng.integers(0, 2, num_donors)
+    is_male = gender_idx == 0
+    first_names = np.where(
+        is_male,
+        male_arr[rng.integers(0, len(male_arr), num_donors)],
+        female_arr[rng.integers(0, len(female_arr), num_donors)]
+    )
+    
+    # Select location and add small random offset to coordinates
+    city_idx = rng.integers(0, len(city_arr), num_donors)
+    state_idx = (city_arr == 'Deal').astype(np.int8)[city_idx]
+    donor_coords = coords[city_idx] + rng.normal(0, 0.01, (num_donors, 2))
+    
+    # Generate wealth indicators (log-normal distribution)
+    donor_ids = np.arange(1, num_donors + 1)
+    wealth_scores = rng.lognormal(10, 1, num_donors).astype(int)
+    
+    # Columns go straight into Arrow; no DataFrame is built just to be written.
+    # Low-cardinality text columns are dictionary encoded from their codes
+    donors_table = pa.table({
+        'donor_id': donor_ids,
+        'first_name': first_names,
+        'last_name': surname_arr[rng.integers(0, len(surname_arr), num_donors)],
+        'gender': pa.DictionaryArray.from_arrays(gender_idx, ['M', 'F']),
+        'city': pa.DictionaryArray.from_arrays(city_idx, city_arr),
+        'state': pa.DictionaryArray.from_arrays(state_idx, ['NY', 'NJ']),
+        'latitude': donor_coords[:, 0],
+        'longitude': donor_coords[:, 1],
+        'wealth_score': wealth_scores
+    })
+    
+    campaigns_table = pa.Table.from_pylist(campaigns)
+    
+    # Donations only depend on each donor's own id and wealth score, so donor
+    # chunks are generated in worker processes, each from a child of this
+    # script's substream
+    n_jobs = max(1, args.jobs)
+    chunks = list(zip(
+        np.array_split(donor_ids, n_jobs),
+        np.array_split(wealth_scores, n_jobs),
+        stream_seq.spawn(n_jobs)
+    ))
+    if n_jobs > 1:
+        with Pool(n_jobs) as pool:
+            parts = pool.starmap(generate_donations, chunks)
+    else:
+        parts = [generate_donations(*chunk) for chunk in chunks]
+    
+    donation_columns = {c: np.concatenate([part[c] for part in parts]) for c in parts[0]}
+    donations_table = pa.table({
+        'donation_id': np.arange(1, len(donation_columns['donor_id']) + 1),
+        **donation_columns
+    })
+    
+    # Save files
+    root = pathlib.Path(__file__).resolve().parents[1]
+    data_dir = root / 'data/raw'
+    
+    write_csv(donors_table, data_dir / 'donors.csv')
+    write_csv(campaigns_table, data_dir / 'campaigns.csv')
+    write_csv(donations_table, data_dir / 'donations.csv')
+    
+    print(f"Created {donors_table.num_rows} donors")
+    print(f"Created {campaigns_table.num_rows} campaigns")
+    print(f"Created {donations_table.num_rows} donations")
 
-print(f"Created {len(donors_df)} donors")
-print(f"Created {len(campaigns_df)} campaigns")
-print(f"Created {len(donations_df)} donations")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -3,15 +3,18 @@ Script to generate UJA Federation engagement events
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import pathlib
+import argparse
+from multiprocessing import Pool
+from arrow_csv import write_csv
 
-# Set up paths
-root = pathlib.Path(__file__).resolve().parents[1]
-raw_data = root / 'data/raw'
-
-# Load donors
-donors = pd.read_csv(raw_data / 'donors.csv')
+parser = argparse.ArgumentParser()
+parser.add_argument("--seed", type=int, default=42, help="Root seed shared by the UJA generators")
+parser.add_argument("--stream-id", type=int, default=1,
+                    help="Substream of the root seed to draw from (generate_uja_data.py uses 0)")
+parser.add_argument("--jobs", type=int, default=1, help="Worker processes for event generation")
+args = parser.parse_args()
 
 # Event types and their descriptions
 event_types = [
@@ -27,34 +30,63 @@ event_types = [
     'Educational Symposium'
 ]
 
-# Create events data
+# Event date window
 start_date = datetime(2023, 1, 1)
 end_date = datetime(2025, 9, 30)
 date_range = (end_date - start_date).days
 
-events = []
-for donor_id in donors['donor_id'].unique():
-    # Randomly decide how many events this donor attended (0-10)
-    num_events = np.random.poisson(2)  # Average of 2 events per donor
-    if num_events > 0:
-        # Generate random dates for each event
-        for _ in range(num_events):
-            event_date = start_date + timedelta(days=np.random.randint(0, date_range))
-            event_type = np.random.choice(event_types)
-            # More volunteer hours for community service events
-            hours = np.random.uniform(2, 6) if event_type == 'Community Service Day' else 0
-            
-            events.append({
-                'donor_id': donor_id,
-                'event_date': event_date,
-                'event_type': event_type,
-                'volunteer_hours': hours
-            })
+def generate_events(donor_ids, seed_seq):
+    """Generate events for one chunk of donors from its own seed substream"""
+    rng = np.random.default_rng(seed_seq)
+    
+    # Number of events each donor attended (average of 2); draw every count at
+    # once and expand donor ids to one row per event
+    num_events = rng.poisson(2, len(donor_ids))
+    total = int(num_events.sum())
+    
+    day_offsets = rng.integers(0, date_range, total)
+    type_idx = rng.integers(0, len(event_types), total)
+    
+    return pd.DataFrame({
+        'donor_id': np.repeat(donor_ids, num_events),
+        'event_date': np.datetime64(start_date.date(), 'D') + day_offsets.astype('timedelta64[D]'),
+        'event_type': pd.Categorical.from_codes(type_idx, categories=event_types),
+        # More volunteer hours for community service events
+        'volunteer_hours': np.where(
+            type_idx == event_types.index('Community Service Day'),
+            rng.uniform(2, 6, total),
+            0.0
+        )
+    })
 
-# Convert to DataFrame and sort
-events_df = pd.DataFrame(events)
-events_df = events_df.sort_values(['donor_id', 'event_date'])
+def main():
+    # Set up paths
+    root = pathlib.Path(__file__).resolve().parents[1]
+    raw_data = root / 'data/raw'
+    
+    # Load donors
+    donors = pd.read_csv(raw_data / 'donors.csv')
+    donor_ids = donors['donor_id'].unique()
+    
+    # Independent substream of the shared root seed, so this script and
+    # generate_uja_data.py never draw overlapping sequences. Donor chunks run
+    # in worker processes, each from a child of that substream
+    stream_seq = np.random.SeedSequence(args.seed).spawn(args.stream_id + 1)[args.stream_id]
+    n_jobs = max(1, args.jobs)
+    chunks = list(zip(np.array_split(donor_ids, n_jobs), stream_seq.spawn(n_jobs)))
+    if n_jobs > 1:
+        with Pool(n_jobs) as pool:
+            parts = pool.starmap(generate_events, chunks)
+    else:
+        parts = [generate_events(*chunk) for chunk in chunks]
+    
+    # Combine and sort
+    events_df = pd.concat(parts, ignore_index=True)
+    events_df = events_df.sort_values(['donor_id', 'event_date'])
+    
+    # Save to CSV
+    write_csv(events_df, raw_data / 'engagement_events.csv')
+    print(f"Created {len(events_df)} event records")
 
-# Save to CSV
-events_df.to_csv(raw_data / 'engagement_events.csv', index=False)
-print(f"Created {len(events_df)} event records")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 # scripts/local_curate.py  (VERBOSE + project-root paths)
 import pandas as pd
+import numpy as np
 import pathlib
 from datetime import datetime
 
@@ -19,15 +20,19 @@ if missing:
     raise FileNotFoundError(f"Missing raw files at {RAW}: {missing}")
 
 print(f"[{datetime.now()}] Reading donors...")
-donors = pd.read_csv(RAW/"donors.csv", parse_dates=["join_date"])
+donors = pd.read_csv(
+    RAW/"donors.csv", parse_dates=["join_date"],
+    dtype={"city":"category", "state":"category", "gender":"category", "source":"category"}
+)
 print(f"  donors: {len(donors):,}")
 
 print(f"[{datetime.now()}] Reading donations...")
-donations = pd.read_csv(RAW/"donations.csv", parse_dates=["donation_date"])
+donations = pd.read_csv(RAW/"donations.csv", parse_dates=["donation_date"],
+                        dtype={"payment_method":"category"})
 print(f"  donations: {len(donations):,}")
 
 print(f"[{datetime.now()}] Reading engagement & wealth...")
-events = pd.read_csv(RAW/"engagement_events.csv")
+events = pd.read_csv(RAW/"engagement_events.csv", dtype={"event_type":"category"})
 wealth = pd.read_csv(RAW/"wealth_external.csv")
 
 today = pd.Timestamp("2025-10-03")
@@ -43,22 +48,40 @@ agg = (
     )
 )
 
+# Event-level files carry one row per event; the older per-donor layout
+# already has events_attended and volunteer_hours, which sum to themselves
+print(f"[{datetime.now()}] Aggregating engagement...")
+by_donor = events.groupby("donor_id")
+event_features = pd.DataFrame({
+    "events_attended": by_donor["events_attended"].sum() if "events_attended" in events else by_donor.size(),
+    "volunteer_hours": by_donor["volunteer_hours" if "volunteer_hours" in events else "hours"].sum(),
+})
+
 print(f"[{datetime.now()}] Joining features...")
-features = (
-    donors.merge(agg, on="donor_id", how="left")
-          .merge(events, on="donor_id", how="left")
-          .merge(wealth[["donor_id","wealth_score_ext"]], on="donor_id", how="left")
-)
+# Every right-hand index is unique per donor_id, so this is one aligned left
+# join instead of three chained merges
+features = donors.set_index("donor_id").join(
+    [agg.set_index("donor_id"),
+     event_features,
+     wealth.set_index("donor_id")[["wealth_score_ext"]]],
+    how="left"
+).reset_index()
 
 print(f"[{datetime.now()}] Filling NAs and writing outputs...")
-features = features.fillna({
-    "total_amount":0, "frequency":0, "recency_days":9999,
-    "events_attended":0, "volunteer_hours":0, "wealth_score_ext":0
-})
+# Fill and narrow each column in one step: counts as int32, day spans and
+# event counts as int16, hours and scores as float32. Money stays float64 so
+# totals above 2**24 keep every dollar
+fill_dtypes = {
+    "total_amount":(0, np.float64), "frequency":(0, np.int32), "recency_days":(9999, np.int16),
+    "events_attended":(0, np.int16), "volunteer_hours":(0, np.float32), "wealth_score_ext":(0, np.float32)
+}
+for c, (fill, dtype) in fill_dtypes.items():
+    if c in features:
+        features[c] = features[c].fillna(fill).astype(dtype)
 
 CUR.mkdir(parents=True, exist_ok=True)
-features.to_csv(CUR/"donor_features.csv", index=False)
-donations.to_csv(CUR/"fact_donation.csv", index=False)
-donors.to_csv(CUR/"dim_donor.csv", index=False)
+features.to_parquet(CUR/"donor_features.parquet", engine="pyarrow", compression="zstd", index=False)
+donations.to_parquet(CUR/"fact_donation.parquet", engine="pyarrow", compression="zstd", index=False)
+donors.to_parquet(CUR/"dim_donor.parquet", engine="pyarrow", compression="zstd", index=False)
 
 print(f"[{datetime.now()}] Curated written → {CUR}")
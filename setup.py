@@ -7,6 +7,7 @@ setup(
     install_requires=[
         # Core dependencies
         "pandas>=1.5.0",
+        "pyarrow>=12.0.0",
         "numpy>=1.21.0",
         "scikit-learn>=1.0.2",
         "xgboost>=1.7.0",
@@ -31,23 +31,18 @@ def sample_data():
         'recency_days': np.random.randint(1, 365, size=n_donors)
     })
     
-    donations = []
-    for _, donor in donors.iterrows():
-        n_donations = donor['frequency']
-        donation_dates = pd.date_range(
-            start=donor['first_donation'],
-            periods=n_donations,
-            freq='M'
-        )
-        
-        for date in donation_dates:
-            donations.append({
-                'donor_id': donor['donor_id'],
-                'donation_date': date,
-                'amount': np.random.gamma(shape=2, scale=100)
-            })
-    
-    donations = pd.DataFrame(donations)
+    # One donation per month end, starting from each donor's first donation
+    counts = donors['frequency'].values
+    n_total = counts.sum()
+    month_offsets = np.arange(n_total) - np.repeat(np.cumsum(counts) - counts, counts)
+    first_months = np.repeat(donors['first_donation'].values.astype('datetime64[M]'), counts)
+    month_ends = (first_months + month_offsets + 1).astype('datetime64[D]') - 1
+    
+    donations = pd.DataFrame({
+        'donor_id': np.repeat(donors['donor_id'].values, counts),
+        'donation_date': pd.to_datetime(month_ends),
+        'amount': np.random.gamma(shape=2, scale=100, size=n_total)
+    })
     
     return {
         'donors': donors,
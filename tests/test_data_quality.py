@@ -88,10 +88,10 @@ def test_data_completeness(donor_analytics):
 def test_referential_integrity(donor_analytics):
     """Test referential integrity"""
     # Test donor_id foreign key
-    donation_donor_ids = set(donor_analytics.donations['donor_id'])
-    donor_ids = set(donor_analytics.donors['donor_id'])
-    
-    assert donation_donor_ids.issubset(donor_ids)
+    assert np.isin(
+        donor_analytics.donations['donor_id'].unique(),
+        donor_analytics.donors['donor_id'].unique()
+    ).all()
     
 def test_temporal_consistency(donor_analytics):
     """Test temporal consistency"""
@@ -101,13 +101,12 @@ def test_temporal_consistency(donor_analytics):
     assert (pd.to_datetime(donations['donation_date']) <= pd.Timestamp.now()).all()
     
     # Test join dates are before first donation
-    donor_first_donations = donations.groupby('donor_id')['donation_date'].min()
+    donor_first_donations = donations.groupby('donor_id')['donation_date'].min().reset_index(name='first')
     donors_with_join = donor_analytics.donors[
         donor_analytics.donors['join_date'].notnull()
     ]
     
-    for _, donor in donors_with_join.iterrows():
-        if donor['donor_id'] in donor_first_donations:
-            assert pd.to_datetime(donor['join_date']) <= pd.to_datetime(
-                donor_first_donations[donor['donor_id']]
-            )
\ No newline at end of file
+    joined = donors_with_join[['donor_id', 'join_date']].merge(
+        donor_first_donations, on='donor_id', how='inner'
+    )
+    assert pd.to_datetime(joined['join_date']).le(pd.to_datetime(joined['first'])).all()
\ No newline at end of file